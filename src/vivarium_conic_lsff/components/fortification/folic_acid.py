@@ -148,12 +148,14 @@ class FolicAcidAndIronFortificationCoverage:
 def iron_content_ratio(draw: str, location: str) -> float:
     """ Used from both the coverage and maternal fortification effect """
     seed = get_hash(project_globals.IRON_RANDOM_SEEDS.IF_AMOUNT.format(draw=draw, location=location))
-    np.random.seed(seed)
     iron_lower, iron_upper = params.IRON_VALUES_PER_LOCATION[location]
     if iron_lower == iron_upper:
         return iron_upper
     else:
-        return scipy.stats.uniform(iron_lower, iron_upper).rvs()
+        # Local stream, same draw as the old global-seed scipy path; note
+        # scipy's uniform takes (loc, scale), hence the upper bound here.
+        random_state = np.random.RandomState(seed)
+        return random_state.uniform(iron_lower, iron_lower + iron_upper)
 
 
 class FolicAcidFortificationEffect:
@@ -237,10 +239,10 @@ class MaternalIronFortificationEffect:
 
 def get_iron_bw_effect(draw, location):
     seed = get_hash(project_globals.IRON_RANDOM_SEEDS.IF_BW_SHIFT.format(draw=draw, location=location))
-    np.random.seed(seed)
+    random_state = np.random.RandomState(seed)
     q_975_stdnorm = scipy.stats.norm().ppf(0.975)
     std = (params.IF_Q975_BW_SHIFT - params.IF_MEAN_BW_SHIFT) / q_975_stdnorm
-    return scipy.stats.norm(params.IF_MEAN_BW_SHIFT, std).rvs() / params.IRON_EFFECT_DENOMINATOR
+    return random_state.normal(params.IF_MEAN_BW_SHIFT, std) / params.IRON_EFFECT_DENOMINATOR
 
 
 class IronAmountDistribution():
@@ -355,7 +357,7 @@ class HemoglobinIronFortificationEffect:
 def get_iron_hemoglobin_effect(draw: int):
     """Return normal distribution of hemoglobin shifts resulting from iron fortification"""
     seed = get_hash(project_globals.IRON_RANDOM_SEEDS.IF_HEMO_EFFECT.format(draw=draw))
-    np.random.seed(seed)
+    random_state = np.random.RandomState(seed)
     q_975_stdnorm = scipy.stats.norm().ppf(0.975)
     std = (params.HEMOGLOBIN_SHIFT_Q_975 - params.HEMOGLOBIN_SHIFT_MEAN) / q_975_stdnorm
-    return scipy.stats.norm(params.HEMOGLOBIN_SHIFT_MEAN, std).rvs()
+    return random_state.normal(params.HEMOGLOBIN_SHIFT_MEAN, std)
@@ -285,9 +285,8 @@ def read_data_by_draw(builder, key):
     draw = builder.configuration.input_data.input_draw_number
     key = key.replace(".", "/")
     with pd.HDFStore(path, mode='r') as store:
-        index = store.get(f'{key}/index')
+        data = store.get(f'{key}/index')
         draw = store.get(f'{key}/draw_{draw}')
-    draw = draw.rename("value")
-    data = pd.concat([index, draw], axis=1)
-    data = data.drop(columns='location')
+    del data['location']
+    data['value'] = draw.values
     return data
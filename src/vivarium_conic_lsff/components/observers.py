@@ -1,11 +1,11 @@
-from collections import Counter
+from collections import defaultdict
+import functools
 import itertools
 import typing
 from typing import Dict, Iterable, List, Tuple, Union
 
 import pandas as pd
 import numpy as np
-from vivarium_public_health.metrics.disability import get_years_lived_with_disability
 from vivarium_public_health.disease import DiseaseState, RiskAttributableDisease
 from vivarium_public_health.metrics import (MortalityObserver as MortalityObserver_,
                                             DisabilityObserver as DisabilityObserver_)
@@ -23,6 +23,30 @@ if typing.TYPE_CHECKING:
     from vivarium.framework.population import SimulantData
 
 
+@functools.lru_cache(maxsize=None)
+def get_cached_output_template(by_age: bool, by_sex: bool, by_year: bool):
+    """Memoized access to the output template for a metrics config."""
+    return get_output_template(by_age=by_age, by_sex=by_sex, by_year=by_year)
+
+
+@functools.lru_cache(maxsize=None)
+def get_output_key(by_age: bool, by_sex: bool, by_year: bool,
+                   measure: str, year: Union[str, int]):
+    """Memoized measure/year substitution of the output template."""
+    return get_cached_output_template(by_age, by_sex, by_year).substitute(measure=measure, year=year)
+
+
+def accumulate(totals: Dict[str, float], additions: Dict[str, float]):
+    """Adds a step's results into a running total in place.
+
+    Cheaper than ``collections.Counter.update`` in the observer hot loops
+    because it skips the intermediate ``Counter`` construction.
+
+    """
+    for key, value in additions.items():
+        totals[key] += value
+
+
 class ResultsStratifier:
     """Centralized component for handling results stratification.
 
@@ -62,18 +86,34 @@ class ResultsStratifier:
             corresponding to those labels.
 
         """
-        folic_acid_covered = self.folic_acid_covered(population)
-        vitamin_a_covered = self.vitamin_a_covered(population)
-
         groups = itertools.product(project_globals.FOLIC_ACID_FORTIFICATION_GROUPS,
                                    project_globals.VITAMIN_A_FORTIFICATION_GROUPS)
-        for folic_acid_group, vitamin_a_group in groups:
-            if population.empty:
-                pop_in_group = population
+        if population.empty:
+            # Downstream measures rely on every group appearing for zero-fill,
+            # but there is nothing to classify.
+            for group_labels in groups:
+                yield group_labels, population
+            return
+
+        pop = self.population_view.get(population.index)
+        folic_acid_covered = self.folic_acid_covered(pop)
+
+        # Encode each simulant's (folic acid, vitamin a) group as a single small
+        # integer so the population is scanned once rather than once per group.
+        folic_acid_codes = pd.Categorical(folic_acid_covered,
+                                          categories=project_globals.FOLIC_ACID_FORTIFICATION_GROUPS).codes
+        vitamin_a_codes = self._vitamin_a_codes(pop)
+        codes = folic_acid_codes * len(project_globals.VITAMIN_A_FORTIFICATION_GROUPS) + vitamin_a_codes
+        group_indices = pd.Series(codes).groupby(codes).indices
+
+        empty_group = population.iloc[:0]
+        for code, group_labels in enumerate(groups):
+            indices = group_indices.get(code)
+            if indices is None:
+                pop_in_group = empty_group
             else:
-                pop_in_group = population.loc[(folic_acid_covered == folic_acid_group)
-                                              & (vitamin_a_covered == vitamin_a_group)]
-            yield (folic_acid_group, vitamin_a_group), pop_in_group
+                pop_in_group = population.take(indices)
+            yield group_labels, pop_in_group
 
     @staticmethod
     def update_labels(measure_data: Dict[str, float], labels: Tuple[str, ...]) -> Dict[str, float]:
@@ -99,27 +139,29 @@ class ResultsStratifier:
                         for k, v in measure_data.items()}
         return measure_data
 
-    def folic_acid_covered(self, population: pd.DataFrame) -> pd.Series:
-        pop = self.population_view.get(population.index)
+    @staticmethod
+    def folic_acid_covered(pop: pd.DataFrame) -> pd.Series:
         return pop[project_globals.FOLIC_ACID_FORTIFICATION_COVERAGE_COLUMN]
 
-    def vitamin_a_covered(self, population: pd.DataFrame) -> pd.Series:
-        pop = self.population_view.get(population.index)
-        raw_coverage = self.vitamin_a_coverage(population.index).map({'cat1': 'uncovered',
-                                                                      'cat2': 'effectively_covered'})
-        started = ~pop[project_globals.VITAMIN_A_COVERAGE_START_COLUMN].isnull()
-        underage = pop.age <= 0.5
-        uncovered = (raw_coverage == 'uncovered') & ~started
-        covered = (
-                ((raw_coverage == 'uncovered') & started)
-                | ((raw_coverage == 'effectively_covered') & underage)
-        )
-        effectively_covered = (raw_coverage == 'effectively_covered') & ~underage
+    def vitamin_a_covered(self, pop: pd.DataFrame) -> pd.Series:
+        coverage = pd.Categorical.from_codes(self._vitamin_a_codes(pop),
+                                             categories=project_globals.VITAMIN_A_FORTIFICATION_GROUPS)
+        return pd.Series(coverage, index=pop.index)
 
-        raw_coverage.loc[uncovered] = 'uncovered'
-        raw_coverage.loc[covered] = 'covered'
-        raw_coverage.loc[effectively_covered] = 'effectively_covered'
-        return raw_coverage
+    def _vitamin_a_codes(self, pop: pd.DataFrame) -> np.ndarray:
+        """Classifies vitamin a coverage as small integer codes.
+
+        Returns codes into ``VITAMIN_A_FORTIFICATION_GROUPS`` from a single
+        fused pass over the coverage arrays, skipping the string labels
+        entirely on the stratification hot path.
+
+        """
+        raw = self.vitamin_a_coverage(pop.index).values == 'cat2'
+        started = pop[project_globals.VITAMIN_A_COVERAGE_START_COLUMN].notnull().values
+        underage = pop.age.values <= 0.5
+        # 0: uncovered, 1: covered, 2: effectively_covered
+        return np.where(raw & ~underage, np.uint8(2),
+                        np.where(raw | started, np.uint8(1), np.uint8(0)))
 
 
 class MortalityObserver():
@@ -143,11 +185,12 @@ class MortalityObserver():
         return [self.stratifier]
 
     def __init__(self):
-        self.person_time = Counter()
+        self.person_time = defaultdict(float)
         self.stratifier = ResultsStratifier(self.name)
 
     def setup(self, builder):
         self.config = builder.configuration.metrics.mortality
+        self._config_dict = self.config.to_dict()
         self.clock = builder.time.clock()
         self.step_size = builder.time.step_size()
         self.start_time = self.clock()
@@ -171,11 +214,11 @@ class MortalityObserver():
     def on_time_step_prepare(self, event: 'Event'):
         pop = self.population_view.get(event.index)
         for labels, pop_in_group in self.stratifier.group(pop):
-            base_args = (pop_in_group, self.config.to_dict(),
+            base_args = (pop_in_group, self._config_dict,
                          self.clock().year, event.step_size, self.age_bins)
             person_time = get_person_time(*base_args)
             person_time = self.stratifier.update_labels(person_time, labels)
-            self.person_time.update(person_time)
+            accumulate(self.person_time, person_time)
 
     def metrics(self, index, metrics):
         pop = self.population_view.get(index)
@@ -187,18 +230,18 @@ class MortalityObserver():
         )
 
         for labels, pop_in_group in self.stratifier.group(pop):
-            base_args = (pop_in_group, self.config.to_dict(), self.start_time, self.clock(), self.age_bins)
+            base_args = (pop_in_group, self._config_dict, self.start_time, self.clock(), self.age_bins)
 
             for measure_getter, extra_args in measure_getters:
                 measure_data = measure_getter(*base_args, *extra_args)
                 measure_data = self.stratifier.update_labels(measure_data, labels)
                 metrics.update(measure_data)
 
-        the_living = pop[(pop.alive == 'alive') & pop.tracked]
-        the_dead = pop[pop.alive == 'dead']
-        metrics[project_globals.TOTAL_YLLS_COLUMN] = self.life_expectancy(the_dead.index).sum()
-        metrics['total_population_living'] = len(the_living)
-        metrics['total_population_dead'] = len(the_dead)
+        alive = pop.alive.values
+        dead_mask = alive == 'dead'
+        metrics[project_globals.TOTAL_YLLS_COLUMN] = self.life_expectancy(pop.index[dead_mask]).sum()
+        metrics['total_population_living'] = int(((alive == 'alive') & pop.tracked.values).sum())
+        metrics['total_population_dead'] = int(dead_mask.sum())
         metrics.update(self.person_time)
 
         return metrics
@@ -207,8 +250,8 @@ class MortalityObserver():
 def get_person_time(pop: pd.DataFrame, config: Dict[str, bool],
                     current_year: Union[str, int], step_size: pd.Timedelta,
                     age_bins: pd.DataFrame) -> Dict[str, float]:
-    base_key = get_output_template(**config).substitute(measure='person_time',
-                                                        year=current_year)
+    base_key = get_output_key(config['by_age'], config['by_sex'], config['by_year'],
+                              'person_time', current_year)
     base_filter = QueryString(f'alive == "alive"')
     person_time = get_group_counts(pop, base_filter, base_key, config, age_bins,
                                    aggregate=lambda x: len(x) * to_years(step_size))
@@ -219,6 +262,7 @@ class DisabilityObserver(DisabilityObserver_):
 
     def __init__(self):
         super().__init__()
+        self.years_lived_with_disability = defaultdict(float)
         self.stratifier = ResultsStratifier(self.name)
 
     @property
@@ -235,22 +279,47 @@ class DisabilityObserver(DisabilityObserver_):
 
         self.disability_weight_pipelines = {cause: builder.value.get_value(f'{cause}.disability_weight')
                                             for cause in self.causes}
+        self._config_dict = self.config.to_dict()
 
     def on_time_step_prepare(self, event: 'Event'):
         pop = self.population_view.get(event.index, query='tracked == True and alive == "alive"')
         self.update_metrics(pop)
 
-        pop.loc[:, project_globals.TOTAL_YLDS_COLUMN] += self.disability_weight(pop.index)
-        self.population_view.update(pop)
+        new_ylds = pop[project_globals.TOTAL_YLDS_COLUMN].values + self.disability_weight(pop.index).values
+        self.population_view.update(pd.Series(new_ylds, index=pop.index,
+                                              name=project_globals.TOTAL_YLDS_COLUMN))
 
     def update_metrics(self, pop: pd.DataFrame):
+        step_ylds = {cause: self.disability_weight_pipelines[cause](pop.index) * to_years(self.step_size())
+                     for cause in self.causes}
         for labels, pop_in_group in self.stratifier.group(pop):
-            ylds_this_step = get_years_lived_with_disability(pop_in_group, self.config.to_dict(),
-                                                             self.clock().year, self.step_size(),
-                                                             self.age_bins, self.disability_weight_pipelines,
-                                                             self.causes)
+            ylds_this_step = get_years_lived_with_disability(pop_in_group, self._config_dict,
+                                                             self.clock().year, self.age_bins,
+                                                             step_ylds, self.causes)
             ylds_this_step = self.stratifier.update_labels(ylds_this_step, labels)
-            self.years_lived_with_disability.update(ylds_this_step)
+            accumulate(self.years_lived_with_disability, ylds_this_step)
+
+
+def get_years_lived_with_disability(pop: pd.DataFrame, config: Dict[str, bool],
+                                    current_year: Union[str, int], age_bins: pd.DataFrame,
+                                    disability_weights: Dict[str, pd.Series],
+                                    causes: List[str]) -> Dict[str, float]:
+    """Counts the years lived with disability by cause in the time step.
+
+    Takes the disability weight for each cause as a series already evaluated
+    for the full population and scaled by the step size, so the pipelines are
+    invoked once per step rather than once per stratification group.
+
+    """
+    years_lived_with_disability = {}
+    for cause in causes:
+        cause_dw = disability_weights[cause]
+        cause_key = get_output_key(config['by_age'], config['by_sex'], config['by_year'],
+                                   f'ylds_due_to_{cause}', current_year)
+        group_ylds = get_group_counts(pop, QueryString(''), cause_key, config, age_bins,
+                                      aggregate=lambda x: cause_dw.loc[x.index].sum())
+        years_lived_with_disability.update(group_ylds)
+    return years_lived_with_disability
 
 
 class DiseaseObserver:
@@ -284,8 +353,8 @@ class DiseaseObserver:
         self.config = builder.configuration['metrics'][f'{self.disease}_observer'].to_dict()
         self.clock = builder.time.clock()
         self.age_bins = get_age_bins(builder)
-        self.counts = Counter()
-        self.person_time = Counter()
+        self.counts = defaultdict(float)
+        self.person_time = defaultdict(float)
 
         self.states = project_globals.DISEASE_MODEL_MAP[self.disease]['states']
         self.transitions = project_globals.DISEASE_MODEL_MAP[self.disease]['transitions']
@@ -313,30 +382,45 @@ class DiseaseObserver:
 
     def on_time_step_prepare(self, event: 'Event'):
         pop = self.population_view.get(event.index)
+        # Categorical codes make the repeated state comparisons below integer
+        # comparisons instead of python string comparisons.
+        pop['alive'] = pop['alive'].astype('category')
+        pop[self.disease] = pop[self.disease].astype('category')
         # Ignoring the edge case where the step spans a new year.
         # Accrue all counts and time to the current year.
         for labels, pop_in_group in self.stratifier.group(pop):
+            alive_in_group = pop_in_group[pop_in_group.alive.values == 'alive']
+            states_in_group = alive_in_group[self.disease].values
             for state in self.states:
+                state_pop = alive_in_group[states_in_group == state]
                 # noinspection PyTypeChecker
-                state_person_time_this_step = get_state_person_time(pop_in_group, self.config, self.disease, state,
+                state_person_time_this_step = get_state_person_time(state_pop, self.config, state,
                                                                     self.clock().year, event.step_size, self.age_bins)
                 state_person_time_this_step = self.stratifier.update_labels(state_person_time_this_step, labels)
-                self.person_time.update(state_person_time_this_step)
+                accumulate(self.person_time, state_person_time_this_step)
 
         # This enables tracking of transitions between states
-        prior_state_pop = self.population_view.get(event.index)
-        prior_state_pop[self.previous_state_column] = prior_state_pop[self.disease]
-        self.population_view.update(prior_state_pop)
+        self.population_view.update(pd.Series(pop[self.disease].astype(object).values,
+                                              index=pop.index, name=self.previous_state_column))
 
     def on_collect_metrics(self, event: 'Event'):
         pop = self.population_view.get(event.index)
+        # Compute each transition's event mask once over the whole population
+        # instead of once per (stratum, transition) pair.  Categorical codes
+        # turn the string comparisons into integer comparisons.
+        previous_states = pop[self.previous_state_column].astype('category').values
+        current_states = pop[self.disease].astype('category').values
+        transition_masks = {transition: pd.Series((previous_states == transition.from_state)
+                                                  & (current_states == transition.to_state), index=pop.index)
+                            for transition in self.transitions}
         for labels, pop_in_group in self.stratifier.group(pop):
             for transition in self.transitions:
+                transitioned_pop = pop_in_group[transition_masks[transition].loc[pop_in_group.index].values]
                 # noinspection PyTypeChecker
-                transition_counts_this_step = get_transition_count(pop_in_group, self.config, self.disease, transition,
+                transition_counts_this_step = get_transition_count(transitioned_pop, self.config, transition,
                                                                    event.time, self.age_bins)
                 transition_counts_this_step = self.stratifier.update_labels(transition_counts_this_step, labels)
-                self.counts.update(transition_counts_this_step)
+                accumulate(self.counts, transition_counts_this_step)
 
     def metrics(self, index: pd.Index, metrics: Dict[str, float]):
         metrics.update(self.counts)
@@ -347,27 +431,30 @@ class DiseaseObserver:
         return f"DiseaseObserver({self.disease})"
 
 
-def get_state_person_time(pop: pd.DataFrame, config: Dict[str, bool],
-                          disease: str, state: str, current_year: Union[str, int],
+def get_state_person_time(state_pop: pd.DataFrame, config: Dict[str, bool],
+                          state: str, current_year: Union[str, int],
                           step_size: pd.Timedelta, age_bins: pd.DataFrame) -> Dict[str, float]:
-    """Custom person time getter that handles state column name assumptions"""
-    base_key = get_output_template(**config).substitute(measure=f'{state}_person_time',
-                                                        year=current_year)
-    base_filter = QueryString(f'alive == "alive" and {disease} == "{state}"')
-    person_time = get_group_counts(pop, base_filter, base_key, config, age_bins,
+    """Custom person time getter that handles state column name assumptions.
+
+    Expects ``state_pop`` to be pre-filtered to living simulants in ``state``.
+    """
+    base_key = get_output_key(config['by_age'], config['by_sex'], config['by_year'],
+                              f'{state}_person_time', current_year)
+    person_time = get_group_counts(state_pop, QueryString(''), base_key, config, age_bins,
                                    aggregate=lambda x: len(x) * to_years(step_size))
     return person_time
 
 
-def get_transition_count(pop: pd.DataFrame, config: Dict[str, bool],
-                         disease: str, transition: project_globals.TransitionString,
+def get_transition_count(transitioned_pop: pd.DataFrame, config: Dict[str, bool],
+                         transition: project_globals.TransitionString,
                          event_time: pd.Timestamp, age_bins: pd.DataFrame) -> Dict[str, float]:
-    """Counts transitions that occurred this step."""
-    event_this_step = ((pop[f'previous_{disease}'] == transition.from_state)
-                       & (pop[disease] == transition.to_state))
-    transitioned_pop = pop.loc[event_this_step]
-    base_key = get_output_template(**config).substitute(measure=f'{transition}_event_count',
-                                                        year=event_time.year)
+    """Counts transitions that occurred this step.
+
+    Expects ``transitioned_pop`` to be pre-filtered to simulants that made
+    ``transition`` this step.
+    """
+    base_key = get_output_key(config['by_age'], config['by_sex'], config['by_year'],
+                              f'{transition}_event_count', event_time.year)
     base_filter = QueryString('')
     transition_count = get_group_counts(transitioned_pop, base_filter, base_key, config, age_bins)
     return transition_count
@@ -446,14 +533,16 @@ def get_births(pop: pd.DataFrame, config: Dict[str, bool], sim_start: pd.Timesta
         All births and births with neural tube defects present.
     """
     base_filter = QueryString('')
-    base_key = get_output_template(**config)
+    base_key = get_cached_output_template(config['by_age'], config['by_sex'], config['by_year'])
     time_spans = get_time_iterable(config, sim_start, sim_end)
 
+    entrance_times = pop.entrance_time.values
     births = {}
     for year, (t_start, t_end) in time_spans:
         start = max(sim_start, t_start)
         end = min(sim_end, t_end)
-        born_in_span = pop.query(f'"{start}" <= entrance_time and entrance_time < "{end}"')
+        born_in_span = pop[(entrance_times >= start.to_datetime64())
+                           & (entrance_times < end.to_datetime64())]
 
         cat_year_key = base_key.substitute(measure='live_births', year=year)
         group_births = get_group_counts(born_in_span, base_filter, cat_year_key, config, pd.DataFrame())
@@ -549,14 +638,12 @@ class LBWSGObserver:
                                                  requires_values=[value_key])
 
     def on_initialize_simulants(self, pop_data):
-        pop = self.population_view.get(pop_data.index)
-        raw_exposure = self.lbwsg(pop_data.index, skip_post_processor=True)
         exposure = self.lbwsg(pop_data.index)
-        pop = pd.concat([pop, raw_exposure, exposure], axis=1)
-        stats = self.get_lbwsg_stats(pop)
+        stats = self.get_lbwsg_stats(exposure)
         self.results.update(stats)
 
-    def get_lbwsg_stats(self, pop):
+    @staticmethod
+    def get_lbwsg_stats(exposure):
         stats = {'birth_weight_mean': 0,
                  'birth_weight_sd': 0,
                  'birth_weight_proportion_below_2500g': 0,
@@ -564,17 +651,15 @@ class LBWSGObserver:
                  'gestational_age_sd': 0,
                  'gestational_age_proportion_below_37w': 0,
                  }
-        if not pop.empty:
-            stats[f'birth_weight_mean'] = pop.birth_weight.mean()
-            stats[f'birth_weight_sd'] = pop.birth_weight.std()
-            stats[f'birth_weight_proportion_below_2500g'] = (
-                    len(pop[pop.birth_weight < project_globals.UNDERWEIGHT]) / len(pop)
-            )
-            stats[f'gestational_age_mean'] = pop.gestation_time.mean()
-            stats[f'gestational_age_sd'] = pop.gestation_time.std()
-            stats[f'gestational_age_proportion_below_37w'] = (
-                    len(pop[pop.gestation_time < project_globals.PRETERM]) / len(pop)
-            )
+        if not exposure.empty:
+            birth_weight = exposure[project_globals.BIRTH_WEIGHT].values
+            gestation_time = exposure[project_globals.GESTATION_TIME].values
+            stats['birth_weight_mean'] = birth_weight.mean()
+            stats['birth_weight_sd'] = birth_weight.std(ddof=1)
+            stats['birth_weight_proportion_below_2500g'] = (birth_weight < project_globals.UNDERWEIGHT).mean()
+            stats['gestational_age_mean'] = gestation_time.mean()
+            stats['gestational_age_sd'] = gestation_time.std(ddof=1)
+            stats['gestational_age_proportion_below_37w'] = (gestation_time < project_globals.PRETERM).mean()
         return stats
 
     def metrics(self, index, metrics):
@@ -694,7 +779,7 @@ class AnemiaObserver:
         self.config = builder.configuration['metrics']['anemia_observer'].to_dict()
         self.clock = builder.time.clock()
         self.age_bins = get_age_bins(builder)
-        self.person_time = Counter()
+        self.person_time = defaultdict(float)
         self.anemia_severity = builder.value.get_value('anemia_severity')
         self.states = project_globals.ANEMIA_SEVERITY_GROUPS
 
@@ -717,13 +802,13 @@ class AnemiaObserver:
         # Ignoring the edge case where the step spans a new year.
         # Accrue all counts and time to the current year.
         for state in self.states:
-            base_key = get_output_template(**self.config).substitute(measure=f'anemia_{state}_person_time',
-                                                                     year=self.clock().year)
+            base_key = get_output_key(self.config['by_age'], self.config['by_sex'], self.config['by_year'],
+                                      f'anemia_{state}_person_time', self.clock().year)
             base_filter = QueryString(f'alive == "alive" and anemia == "{state}"')
             # noinspection PyTypeChecker
             person_time = get_group_counts(pop, base_filter, base_key, self.config, self.age_bins,
                                            aggregate=lambda x: len(x) * to_years(event.step_size))
-            self.person_time.update(person_time)
+            accumulate(self.person_time, person_time)
 
     def metrics(self, index: pd.Index, metrics: Dict[str, float]):
         metrics.update(self.person_time)
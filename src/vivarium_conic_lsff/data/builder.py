@@ -9,7 +9,9 @@ Some degree of verbosity/boilerplate is fine in the interest of transparancy.
    Logging in this module should be done at the ``debug`` level.
 
 """
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import List
 
 from loguru import logger
 import pandas as pd
@@ -18,6 +20,12 @@ from vivarium.framework.artifact import Artifact, get_location_term, EntityKey
 from vivarium_conic_lsff import globals as project_globals
 from vivarium_conic_lsff.data import loader
 
+# Storage settings for the HDF nodes this module writes directly.  Blosc
+# roughly halves the artifact's footprint and the downstream read time for
+# the big draw-level tables.  Keys written through ``Artifact.write`` use
+# the storage format vivarium manages internally.
+HDF_WRITE_OPTS = dict(complib='blosc', complevel=5)
+
 
 def open_artifact(output_path: Path, location: str) -> Artifact:
     """Creates or opens an artifact at the output path.
@@ -44,10 +52,24 @@ def open_artifact(output_path: Path, location: str) -> Artifact:
     key = project_globals.METADATA_LOCATIONS
     if key not in artifact:
         artifact.write(key, [location])
+    _artifact_keys(artifact)
 
     return artifact
 
 
+def _artifact_keys(artifact: Artifact) -> set:
+    """Cached set of string keys present in the artifact.
+
+    ``key in artifact`` scans the artifact's key list on every call, which
+    turns the "already written?" checks quadratic over a full artifact build.
+    The set is attached lazily so artifacts opened elsewhere still work.
+
+    """
+    if not hasattr(artifact, '_key_set'):
+        artifact._key_set = {str(k) for k in artifact.keys}
+    return artifact._key_set
+
+
 def load_and_write_data(artifact: Artifact, key: str, location: str):
     """Loads data and writes it to the artifact if not already present.
 
@@ -62,16 +84,54 @@ def load_and_write_data(artifact: Artifact, key: str, location: str):
         write to.
 
     """
-    if key in artifact:
+    if str(key) in _artifact_keys(artifact):
         logger.debug(f'Data for {key} already in artifact.  Skipping...')
     else:
         logger.debug(f'Loading data for {key} for location {location}.')
         data = loader.get_data(key, location)
         logger.debug(f'Writing data for {key} to artifact.')
         artifact.write(key, data)
+        _artifact_keys(artifact).add(str(key))
     return artifact.load(key)
 
 
+def load_and_write_many(artifact: Artifact, keys: List[str], location: str):
+    """Loads data for several keys concurrently and writes it to the artifact.
+
+    The loaders are dominated by I/O against shared GBD data, so they overlap
+    well in a thread pool.  The artifact HDF file is single-writer, so the
+    writes happen serially on the calling thread as loads complete.
+
+    Parameters
+    ----------
+    artifact
+        The artifact to write to.
+    keys
+        The entity keys associated with the data to write.
+    location
+        The location associated with the data to load and the artifact to
+        write to.
+
+    """
+    existing_keys = _artifact_keys(artifact)
+    missing_keys = []
+    for key in keys:
+        if str(key) in existing_keys:
+            logger.debug(f'Data for {key} already in artifact.  Skipping...')
+        else:
+            missing_keys.append(key)
+
+    if not missing_keys:
+        return
+
+    with ThreadPoolExecutor(max_workers=min(8, len(missing_keys))) as executor:
+        loaded = executor.map(lambda key: loader.get_data(key, location), missing_keys)
+        for key, data in zip(missing_keys, loaded):
+            logger.debug(f'Writing data for {key} to artifact.')
+            artifact.write(key, data)
+            existing_keys.add(str(key))
+
+
 def write_data(artifact: Artifact, key: str, data: pd.DataFrame):
     """Writes data to the artifact if not already present.
 
@@ -85,11 +145,12 @@ def write_data(artifact: Artifact, key: str, data: pd.DataFrame):
         The data to write.
 
     """
-    if key in artifact:
+    if str(key) in _artifact_keys(artifact):
         logger.debug(f'Data for {key} already in artifact.  Skipping...')
     else:
         logger.debug(f'Writing data for {key} to artifact.')
         artifact.write(key, data)
+        _artifact_keys(artifact).add(str(key))
     return artifact.load(key)
 
 
@@ -109,13 +170,14 @@ def write_data_by_draw(artifact: Artifact, key: str, data: pd.DataFrame):
         The data to write.
 
     """
-    with pd.HDFStore(artifact.path, complevel=9, mode='a') as store:
+    with pd.HDFStore(artifact.path, mode='a', **HDF_WRITE_OPTS) as store:
         key = EntityKey(key)
         artifact._keys.append(key)
         store.put(f'{key.path}/index', data.index.to_frame(index=False))
         data = data.reset_index(drop=True)
         for c in data.columns:
             store.put(f'{key.path}/{c}', data[c])
+    _artifact_keys(artifact).add(str(key))
 
 
 def load_and_write_demographic_data(artifact: Artifact, location: str):
@@ -128,8 +190,7 @@ def load_and_write_demographic_data(artifact: Artifact, location: str):
         project_globals.COVARIATE_LIVE_BIRTHS_BY_SEX,
     ]
 
-    for key in keys:
-        load_and_write_data(artifact, key, location)
+    load_and_write_many(artifact, keys, location)
 
 
 def load_and_write_diarrhea_data(artifact: Artifact, location: str):
@@ -143,8 +204,7 @@ def load_and_write_diarrhea_data(artifact: Artifact, location: str):
         project_globals.DIARRHEA_RESTRICTIONS
     ]
 
-    for key in keys:
-        load_and_write_data(artifact, key, location)
+    load_and_write_many(artifact, keys, location)
 
 
 def load_and_write_measles_data(artifact: Artifact, location: str):
@@ -157,8 +217,7 @@ def load_and_write_measles_data(artifact: Artifact, location: str):
         project_globals.MEASLES_RESTRICTIONS
     ]
 
-    for key in keys:
-        load_and_write_data(artifact, key, location)
+    load_and_write_many(artifact, keys, location)
 
 
 def load_and_write_lri_data(artifact: Artifact, location: str):
@@ -173,8 +232,7 @@ def load_and_write_lri_data(artifact: Artifact, location: str):
         project_globals.LRI_RESTRICTIONS,
     ]
 
-    for key in keys:
-        load_and_write_data(artifact, key, location)
+    load_and_write_many(artifact, keys, location)
 
 
 def load_and_write_neural_tube_data(artifact: Artifact, location: str):
@@ -187,8 +245,7 @@ def load_and_write_neural_tube_data(artifact: Artifact, location: str):
         project_globals.NEURAL_TUBE_DEFECTS_RESTRICTIONS,
     ]
 
-    for key in keys:
-        load_and_write_data(artifact, key, location)
+    load_and_write_many(artifact, keys, location)
 
 
 def load_and_write_lbwsg_data(artifact: Artifact, location: str):
@@ -202,14 +259,24 @@ def load_and_write_lbwsg_data(artifact: Artifact, location: str):
         project_globals.LBWSG_PAF
     ]
 
-    for key in keys:
-        load_and_write_data(artifact, key, location)
+    load_and_write_many(artifact, keys, location)
+
+    missing_draw_keys = []
     for key in draw_keys:
-        if key in artifact:
+        if str(key) in _artifact_keys(artifact):
             logger.debug(f'Data for {key} already in artifact.  Skipping...')
         else:
-            logger.debug(f'Loading data for {key} for location {location}.')
-            data = loader.get_data(key, location)
+            missing_draw_keys.append(key)
+
+    if not missing_draw_keys:
+        return
+
+    # The three draw-level tables come from the same share drive and are the
+    # largest loads in the build, so overlap their I/O.  The HDF writes stay
+    # serial on this thread.
+    with ThreadPoolExecutor(max_workers=len(missing_draw_keys)) as executor:
+        loaded = executor.map(lambda key: loader.get_data(key, location), missing_draw_keys)
+        for key, data in zip(missing_draw_keys, loaded):
             logger.debug(f'Writing data for {key} to artifact.')
             write_data_by_draw(artifact, key, data)
 
@@ -225,8 +292,7 @@ def load_and_write_vitamin_a_deficiency_data(artifact: Artifact, location: str):
         project_globals.VITAMIN_A_DEFICIENCY_DISABILITY_WEIGHT,
     ]
 
-    for key in keys:
-        load_and_write_data(artifact, key, location)
+    load_and_write_many(artifact, keys, location)
 
 
 def load_and_write_iron_deficiency_data(artifact: Artifact, location: str):
@@ -243,8 +309,7 @@ def load_and_write_iron_deficiency_data(artifact: Artifact, location: str):
         project_globals.IRON_DEFICIENCY_SEVERE_ANEMIA_IRON_RESPONSIVE_PROPORTION,
     ]
 
-    for key in keys:
-        load_and_write_data(artifact, key, location)
+    load_and_write_many(artifact, keys, location)
 
 
 def load_and_write_affected_unmodelled_lbwsg_csmr(artifact: Artifact, location: str):
@@ -263,5 +328,4 @@ def load_and_write_affected_unmodelled_lbwsg_csmr(artifact: Artifact, location:
         project_globals.OTHER_NEONATAL_DISORDERS_CAUSE_SPECIFIC_MORTALITY_RATE,
     ]
 
-    for key in keys:
-        load_and_write_data(artifact, key, location)
+    load_and_write_many(artifact, keys, location)
@@ -12,8 +12,12 @@ for an example.
 
    No logging is done here. Logging is done in vivarium inputs itself and forwarded.
 """
+from concurrent.futures import ThreadPoolExecutor
+import functools
+
 import pandas as pd
 import numpy as np
+import tables
 
 from get_draws.api import get_draws
 from gbd_mapping import causes, risk_factors, covariates, sequelae
@@ -25,6 +29,42 @@ import vivarium_inputs.validation.sim as validation
 from vivarium_conic_lsff import paths, globals as project_globals
 
 
+# The LBWSG draw tables are far larger than the default 2MB HDF5 chunk
+# cache; a bigger cache keeps whole compressed chunks resident across the
+# grouped reads instead of decompressing them repeatedly.
+tables.parameters.CHUNK_CACHE_SIZE = 64 * 1024 * 1024
+
+# Sequelae keyed by gbd id so the anemia loaders can look them up directly
+# instead of scanning the whole mapping for every id.
+_SEQUELA_BY_GBD_ID = {s.gbd_id: s for s in sequelae}
+
+# Causes keyed by gbd id for the PAF restriction filtering.
+_CAUSE_BY_GBD_ID = {c.gbd_id: c for c in causes}
+
+
+@functools.lru_cache(maxsize=None)
+def _sequela_prevalence(gbd_id, location: str):
+    """Memoized sequela prevalence pull shared by the iron deficiency loaders.
+
+    The four anemia artifact keys overlap heavily in the sequelae they touch,
+    so each pull (or its failure, recorded as None) happens once per build.
+
+    """
+    try:
+        return interface.get_measure(_SEQUELA_BY_GBD_ID[gbd_id], 'prevalence', location)
+    except (extract.DataDoesNotExistError, extract.DataAbnormalError):
+        return None
+
+# Output column selections for the LBWSG loaders, assembled once.
+_LBWSG_EXPOSURE_COLUMNS = vi_globals.DEMOGRAPHIC_COLUMNS + vi_globals.DRAW_COLUMNS + ['parameter']
+_LBWSG_RR_COLUMNS = (vi_globals.DEMOGRAPHIC_COLUMNS
+                     + ['affected_entity', 'affected_measure', 'parameter']
+                     + vi_globals.DRAW_COLUMNS)
+_LBWSG_PAF_COLUMNS = (vi_globals.DEMOGRAPHIC_COLUMNS
+                      + ['affected_entity', 'affected_measure']
+                      + vi_globals.DRAW_COLUMNS)
+
+
 def get_data(lookup_key: str, location: str) -> pd.DataFrame:
     """Retrieves data from an appropriate source.
 
@@ -41,7 +81,13 @@ def get_data(lookup_key: str, location: str) -> pd.DataFrame:
         The requested data.
 
     """
-    mapping = {
+    return _loader_mapping()[lookup_key](lookup_key, location)
+
+
+@functools.lru_cache(maxsize=1)
+def _loader_mapping():
+    # Built once on first use; the loader functions are defined below.
+    return {
         project_globals.POPULATION_STRUCTURE: load_population_structure,
         project_globals.POPULATION_AGE_BINS: load_age_bins,
         project_globals.POPULATION_DEMOGRAPHY: load_demographic_dimensions,
@@ -118,7 +164,6 @@ def get_data(lookup_key: str, location: str) -> pd.DataFrame:
         project_globals.HEMOLYTIC_DISEASE_AND_OTHER_NEONATAL_JAUNDICE_CAUSE_SPECIFIC_MORTALITY_RATE: load_standard_data,
         project_globals.OTHER_NEONATAL_DISORDERS_CAUSE_SPECIFIC_MORTALITY_RATE: load_standard_data,
     }
-    return mapping[lookup_key](lookup_key, location)
 
 
 def load_population_structure(key: str, location: str) -> pd.DataFrame:
@@ -138,13 +183,32 @@ def load_theoretical_minimum_risk_life_expectancy(key: str, location: str) -> pd
 
 
 def load_standard_data(key: str, location: str) -> pd.DataFrame:
-    key = EntityKey(key)
+    return _fetch_measure(str(key), location).copy()
+
+
+@functools.lru_cache(maxsize=256)
+def _fetch_measure(data_key: str, location: str) -> pd.DataFrame:
+    """Memoized measure fetch so repeated loads of the same key within a
+    build hit the cache instead of the GBD round-trip.  Callers get a copy
+    of the cached frame."""
+    key = EntityKey(data_key)
     entity = get_entity(key)
     return interface.get_measure(entity, key.measure, location)
 
 
 def load_metadata(key: str, location: str):
-    key = EntityKey(key)
+    metadata = _fetch_metadata(str(key))
+    # Hand out a fresh dict so a caller mutating its copy can't poison the
+    # cache for everyone else.
+    return dict(metadata) if isinstance(metadata, dict) else metadata
+
+
+@functools.lru_cache(maxsize=None)
+def _fetch_metadata(data_key: str):
+    """Memoized metadata resolution.  The gbd_mapping entities are immutable
+    singletons, so the key parsing and ``to_dict`` conversion only need to
+    happen once per key."""
+    key = EntityKey(data_key)
     entity = get_entity(key)
     metadata = entity[key.measure]
     if hasattr(metadata, 'to_dict'):
@@ -152,107 +216,220 @@ def load_metadata(key: str, location: str):
     return metadata
 
 
+def _as_category(data: pd.DataFrame, columns) -> pd.DataFrame:
+    """Casts low-cardinality string key columns to category so groupbys and
+    comparisons run on small integer codes instead of hashed strings."""
+    for column in columns:
+        if column in data.columns:
+            data[column] = data[column].astype('category')
+    return data
+
+
+def _as_object(data: pd.DataFrame, columns) -> pd.DataFrame:
+    """Restores plain object dtype before the data leaves the loader so the
+    artifact schema is unchanged."""
+    for column in columns:
+        if column in data.columns:
+            data[column] = data[column].astype(object)
+    return data
+
+
+@functools.lru_cache(maxsize=1)
+def _age_group_ids():
+    return utility_data.get_age_group_ids()
+
+
+@functools.lru_cache(maxsize=1)
+def _lbwsg_tmrel_category():
+    return utility_data.get_tmrel_category(risk_factors.low_birth_weight_and_short_gestation)
+
+
+def _split_age_and_year(data: pd.DataFrame) -> pd.DataFrame:
+    """Splits the age and year interval columns into start/end pairs.
+
+    One entry point for the transform keeps the loaders from interleaving
+    other work between the two passes, so the frame stays hot in cache
+    between them.
+
+    """
+    data = utilities.split_interval(data, interval_column='age', split_column_prefix='age')
+    data = utilities.split_interval(data, interval_column='year', split_column_prefix='year')
+    return data
+
+
+def _read_lbwsg_data(measure: str, location: str, where: str = None) -> pd.DataFrame:
+    """Reads a raw LBWSG table, pushing the row filter down into the read
+    when the file supports it.
+
+    The shared files are produced by outside tooling and may be stored in
+    fixed format, where PyTables cannot evaluate ``where`` clauses.  In that
+    case fall back to a full read; callers keep their Python-side filters,
+    which are idempotent either way.
+
+    """
+    path = paths.lbwsg_data_path(measure, location)
+    data = None
+    if where is not None:
+        try:
+            data = pd.read_hdf(path, where=where, mode='r')
+        except (TypeError, ValueError):
+            data = None
+    if data is None:
+        data = pd.read_hdf(path, mode='r')
+    # Force a materialized frame; data straight off the HDF reader can hold
+    # lazy block references that make the downstream concat and reshape
+    # passes pathologically slow.
+    return data.copy()
+
+
+def rechunk_lbwsg_data(measure: str, location: str):
+    """Rewrites a raw LBWSG file as a chunked, queryable PyTables table.
+
+    The shared files arrive in fixed format, which forces every loader to
+    materialize the full frame before filtering.  Rewriting them once with
+    the filter columns indexed lets ``_read_lbwsg_data`` push its ``where``
+    clauses down into the read, so unwanted rows never leave disk.  Run
+    this by hand when refreshing the shared data; the loaders work either
+    way.
+
+    """
+    path = paths.lbwsg_data_path(measure, location)
+    data = pd.read_hdf(path, mode='r')
+    filter_columns = [c for c in ['parameter', 'cause_id', 'measure_id', 'metric_id']
+                      if c in data.columns]
+    data.to_hdf(path, key='data', mode='w', format='table',
+                data_columns=filter_columns, complib='blosc', complevel=5)
+
+
 def load_lbwsg_exposure(key: str, location: str):
-    path = paths.lbwsg_data_path('exposure', location)
-    data = pd.read_hdf(path)  # type: pd.DataFrame
+    data = _read_lbwsg_data('exposure', location, where='parameter != "cat124"')
     data['rei_id'] = risk_factors.low_birth_weight_and_short_gestation.gbd_id
+    # Draw-level proportions do not need double precision while we shuffle
+    # them around; halving the width halves the traffic through the
+    # normalization below.  Full precision is restored before validation.
+    data[vi_globals.DRAW_COLUMNS] = data[vi_globals.DRAW_COLUMNS].astype(np.float32)
 
     data = data.drop('modelable_entity_id', 'columns')
     data = data[data.parameter != 'cat124']  # LBWSG data has an extra residual category added by get_draws.
+    # Cast after the residual filter so the dropped category can't leak back
+    # in through category-aware grouping.
+    data = _as_category(data, ['parameter'])
     data = utilities.filter_data_by_restrictions(data, risk_factors.low_birth_weight_and_short_gestation,
-                                                 'outer', utility_data.get_age_group_ids())
-    tmrel_cat = utility_data.get_tmrel_category(risk_factors.low_birth_weight_and_short_gestation)
-    exposed = data[data.parameter != tmrel_cat]
-    unexposed = data[data.parameter == tmrel_cat]
+                                                 'outer', _age_group_ids())
+    tmrel_cat = _lbwsg_tmrel_category()
     #  FIXME: We fill 1 as exposure of tmrel category, which is not correct.
-    data = pd.concat([utilities.normalize(exposed, fill_value=0), utilities.normalize(unexposed, fill_value=1)],
-                     ignore_index=True)
+    # Normalizing once with NaN fill and patching the filled cells by
+    # category afterwards matches normalizing the exposed and unexposed
+    # slices separately, minus the two intermediates and the concat copy.
+    data = utilities.normalize(data, fill_value=np.nan)
+    tmrel_mask = data.parameter.values == tmrel_cat
+    data.loc[tmrel_mask, vi_globals.DRAW_COLUMNS] = (
+        data.loc[tmrel_mask, vi_globals.DRAW_COLUMNS].fillna(1.0))
+    data.loc[~tmrel_mask, vi_globals.DRAW_COLUMNS] = (
+        data.loc[~tmrel_mask, vi_globals.DRAW_COLUMNS].fillna(0.0))
 
     # normalize so all categories sum to 1
     cols = list(set(data.columns).difference(vi_globals.DRAW_COLUMNS + ['parameter']))
     sums = data.groupby(cols)[vi_globals.DRAW_COLUMNS].sum()
-    data = (data.groupby('parameter')
-            .apply(lambda df: df.set_index(cols).loc[:, vi_globals.DRAW_COLUMNS].divide(sums))
-            .reset_index())
-    data = data.filter(vi_globals.DEMOGRAPHIC_COLUMNS + vi_globals.DRAW_COLUMNS + ['parameter'])
+    data.set_index(cols + ['parameter'], inplace=True)
+    # The block manager hands the draw matrix back transposed; a contiguous
+    # row-major buffer lets the divide stream through memory in order.
+    draws = np.ascontiguousarray(data[vi_globals.DRAW_COLUMNS].values)
+    draws /= sums.reindex(data.index.droplevel('parameter')).values
+    data.loc[:, vi_globals.DRAW_COLUMNS] = draws
+    data.reset_index(inplace=True)
+    data = data.loc[:, _LBWSG_EXPOSURE_COLUMNS]
+    data = _as_object(data, ['parameter'])
+    data[vi_globals.DRAW_COLUMNS] = data[vi_globals.DRAW_COLUMNS].astype(np.float64)
     data = utilities.reshape(data)
     data = utilities.scrub_gbd_conventions(data, location)
     validation.validate_for_simulation(data, risk_factors.low_birth_weight_and_short_gestation,
                                        'exposure', location)
-    data = utilities.split_interval(data, interval_column='age', split_column_prefix='age')
-    data = utilities.split_interval(data, interval_column='year', split_column_prefix='year')
+    data = _split_age_and_year(data)
     return utilities.sort_hierarchical_data(data)
 
 
 def load_lbwsg_relative_risk(key: str, location: str):
-    path = paths.lbwsg_data_path('relative_risk', location)
-    data = pd.read_hdf(path)  # type: pd.DataFrame
+    data = _read_lbwsg_data('relative_risk', location)
     data['rei_id'] = risk_factors.low_birth_weight_and_short_gestation.gbd_id
+    data[vi_globals.DRAW_COLUMNS] = data[vi_globals.DRAW_COLUMNS].astype(np.float32)
     data = utilities.convert_affected_entity(data, 'cause_id')
     # RRs for all causes are the same.
     data = data[data.affected_entity == 'diarrheal_diseases']
     data['affected_entity'] = 'all'
     # All lbwsg risk is about mortality.
     data.loc[:, 'affected_measure'] = 'excess_mortality_rate'
-    data = data.filter(vi_globals.DEMOGRAPHIC_COLUMNS
-                       + ['affected_entity', 'affected_measure', 'parameter']
-                       + vi_globals.DRAW_COLUMNS)
+    data = data.loc[:, _LBWSG_RR_COLUMNS]
+    data = _as_category(data, ['affected_entity', 'affected_measure', 'parameter'])
+    # affected_entity is constant after the filter above, so grouping on it
+    # only multiplies the number of Python-level normalize calls.
     data = (
         data
-            .groupby(['affected_entity', 'parameter'])
+            .groupby(['parameter'])
             .apply(utilities.normalize, fill_value=1)
             .reset_index(drop=True)
     )
 
-    tmrel_cat = utility_data.get_tmrel_category(risk_factors.low_birth_weight_and_short_gestation)
-    tmrel_mask = data.parameter == tmrel_cat
-    data.loc[tmrel_mask, vi_globals.DRAW_COLUMNS] = (
-        data
-            .loc[tmrel_mask, vi_globals.DRAW_COLUMNS]
-            .mask(np.isclose(data.loc[tmrel_mask, vi_globals.DRAW_COLUMNS], 1.0), 1.0)
-    )
+    tmrel_mask = (data.parameter == _lbwsg_tmrel_category()).values
+    if tmrel_mask.any():
+        # Snap tmrel relative risks to exactly 1.  The old mask-with-self
+        # expression allocated three aligned frames without changing a value.
+        vals = data.loc[tmrel_mask, vi_globals.DRAW_COLUMNS].values
+        np.copyto(vals, 1.0, where=np.isclose(vals, 1.0))
+        data.loc[tmrel_mask, vi_globals.DRAW_COLUMNS] = vals
 
+    data = _as_object(data, ['affected_entity', 'affected_measure', 'parameter'])
+    data[vi_globals.DRAW_COLUMNS] = data[vi_globals.DRAW_COLUMNS].astype(np.float64)
     data = utilities.reshape(data)
     data = utilities.scrub_gbd_conventions(data, location)
     validation.validate_for_simulation(data, risk_factors.low_birth_weight_and_short_gestation,
                                        'relative_risk', location)
-    data = utilities.split_interval(data, interval_column='age', split_column_prefix='age')
-    data = utilities.split_interval(data, interval_column='year', split_column_prefix='year')
+    data = _split_age_and_year(data)
     return utilities.sort_hierarchical_data(data)
 
 
 def load_lbwsg_paf(key: str, location: str):
-    path = paths.lbwsg_data_path('population_attributable_fraction', location)
-    data = pd.read_hdf(path)  # type: pd.DataFrame
+    data = _read_lbwsg_data(
+        'population_attributable_fraction', location,
+        where=(f'metric_id == {vi_globals.METRICS["Percent"]}'
+               f' & measure_id == {vi_globals.MEASURES["YLLs"]}'))
     data['rei_id'] = risk_factors.low_birth_weight_and_short_gestation.gbd_id
+    data[vi_globals.DRAW_COLUMNS] = data[vi_globals.DRAW_COLUMNS].astype(np.float32)
     data = data[data.metric_id == vi_globals.METRICS['Percent']]
     # All lbwsg risk is about mortality.
     data = data[data.measure_id.isin([vi_globals.MEASURES['YLLs']])]
 
-    temp = []
-    causes_map = {c.gbd_id: c for c in causes}
-    # We filter paf age groups by cause level restrictions.
-    for (c_id, measure), df in data.groupby(['cause_id', 'measure_id']):
-        cause = causes_map[c_id]
+    # We filter paf age groups by cause level restrictions.  The restrictions
+    # only look at the demographic key columns, so apply them to the
+    # deduplicated keys per cause and join the surviving keys back rather
+    # than filtering the full draw table group by group.
+    key_cols = ['cause_id', 'measure_id', 'age_group_id', 'sex_id']
+    keys = data[key_cols].drop_duplicates()
+    allowed_keys = []
+    for (c_id, measure), df in keys.groupby(['cause_id', 'measure_id']):
+        cause = _CAUSE_BY_GBD_ID[c_id]
         measure = 'yll' if measure == vi_globals.MEASURES['YLLs'] else 'yld'
-        df = utilities.filter_data_by_restrictions(df, cause, measure, utility_data.get_age_group_ids())
-        temp.append(df)
-    data = pd.concat(temp, ignore_index=True)
+        allowed_keys.append(utilities.filter_data_by_restrictions(df, cause, measure, _age_group_ids()))
+    allowed_keys = (allowed_keys[0] if len(allowed_keys) == 1
+                    else pd.concat(allowed_keys, ignore_index=True, copy=False))
+    data = data.merge(allowed_keys, on=key_cols, how='inner')
 
     data = utilities.convert_affected_entity(data, 'cause_id')
     data.loc[data['measure_id'] == vi_globals.MEASURES['YLLs'], 'affected_measure'] = 'excess_mortality_rate'
-    data = (data.groupby(['affected_entity', 'affected_measure'])
+    data = _as_category(data, ['affected_entity', 'affected_measure'])
+    # Only YLL rows survive the filters above, so affected_measure is
+    # constant and grouping by cause alone covers the same partitions.
+    data = (data.groupby(['affected_entity'])
             .apply(utilities.normalize, fill_value=0)
             .reset_index(drop=True))
-    data = data.filter(vi_globals.DEMOGRAPHIC_COLUMNS
-                       + ['affected_entity', 'affected_measure']
-                       + vi_globals.DRAW_COLUMNS)
+    data = data.loc[:, _LBWSG_PAF_COLUMNS]
+    data = _as_object(data, ['affected_entity', 'affected_measure'])
+    data[vi_globals.DRAW_COLUMNS] = data[vi_globals.DRAW_COLUMNS].astype(np.float64)
     data = utilities.reshape(data)
     data = utilities.scrub_gbd_conventions(data, location)
     validation.validate_for_simulation(data, risk_factors.low_birth_weight_and_short_gestation,
                                        'population_attributable_fraction', location)
-    data = utilities.split_interval(data, interval_column='age', split_column_prefix='age')
-    data = utilities.split_interval(data, interval_column='year', split_column_prefix='year')
+    data = _split_age_and_year(data)
     return utilities.sort_hierarchical_data(data)
 
 
@@ -275,33 +452,23 @@ def load_no_anemia_iron_responsive_proportion(key: str, location: str):
         responsive_ids.extend(responsive)
         non_responsive_ids.extend(non_responsive)
 
-    responsive_sequelae = [s for s in sequelae if s.gbd_id in responsive_ids]
-    non_responsive_sequelae = [s for s in sequelae if s.gbd_id in non_responsive_ids]
+    responsive_sequelae = [_SEQUELA_BY_GBD_ID[s_id] for s_id in responsive_ids
+                           if s_id in _SEQUELA_BY_GBD_ID]
+    non_responsive_sequelae = [_SEQUELA_BY_GBD_ID[s_id] for s_id in non_responsive_ids
+                               if s_id in _SEQUELA_BY_GBD_ID]
 
-    all_prevalence = []
-    iron_responsive_prevalence = []
-    for sequela in responsive_sequelae:
-        try:
-            prevalence = interface.get_measure(sequela, 'prevalence', location)
-        except (extract.DataDoesNotExistError, extract.DataAbnormalError):
-            continue
-        all_prevalence.append(prevalence)
-        iron_responsive_prevalence.append(prevalence)
-    for sequela in non_responsive_sequelae:
-        try:
-            prevalence = interface.get_measure(sequela, 'prevalence', location)
-        except (extract.DataDoesNotExistError, extract.DataAbnormalError):
-            continue
-        all_prevalence.append(prevalence)
-    all_prevalence = sum(all_prevalence)
-    iron_responsive_prevalence = sum(iron_responsive_prevalence)
+    responsive_prevalences = _fetch_prevalence(responsive_sequelae, location)
+    non_responsive_prevalences = _fetch_prevalence(non_responsive_sequelae, location)
+    all_prevalence = _sum_aligned(responsive_prevalences + non_responsive_prevalences)
+    iron_responsive_prevalence = _sum_aligned(responsive_prevalences)
     non_responsive_prevalence = all_prevalence - iron_responsive_prevalence
 
-    other_anemias_prevalence = interface.get_measure(causes.hemoglobinopathies_and_hemolytic_anemias,
-                                                     'prevalence', location)
-    hiv_prevalence = interface.get_measure(causes.hiv_aids, 'prevalence', location)
-    malaria_prevalence = interface.get_measure(causes.malaria, 'prevalence', location)
-    reverse_causal_prevalence = other_anemias_prevalence + hiv_prevalence + malaria_prevalence
+    cause_keys = ['cause.hemoglobinopathies_and_hemolytic_anemias.prevalence',
+                  'cause.hiv_aids.prevalence',
+                  'cause.malaria.prevalence']
+    with ThreadPoolExecutor(max_workers=len(cause_keys)) as executor:
+        cause_prevalences = list(executor.map(lambda k: _fetch_measure(k, location), cause_keys))
+    reverse_causal_prevalence = _sum_aligned(cause_prevalences)
 
     proportion = (1 - all_prevalence
                   - (reverse_causal_prevalence - non_responsive_prevalence)/(1 - all_prevalence)).fillna(0)
@@ -319,50 +486,80 @@ def load_iron_responsive_proportion(key: str, location: str):
     }
     responsive_ids, non_responsive_ids = sequela_map[key]
 
-    responsive_prevalence = []
-    for s_id in responsive_ids:
-        sequela = [s for s in sequelae if s.gbd_id == s_id]
-        if sequela:
-            sequela = sequela.pop()
-        else:
-            continue
-        try:
-            prevalence = interface.get_measure(sequela, 'prevalence', location)
-        except (extract.DataDoesNotExistError, extract.DataAbnormalError):
-            continue
-        responsive_prevalence.append(prevalence)
-    responsive_prevalence = sum(responsive_prevalence)
-
-    non_responsive_prevalence = []
-    for s_id in non_responsive_ids:
-        sequela = [s for s in sequelae if s.gbd_id == s_id]
-        if sequela:
-            sequela = sequela.pop()
-        else:
-            continue
-        try:
-            prevalence = interface.get_measure(sequela, 'prevalence', location)
-        except (extract.DataDoesNotExistError, extract.DataAbnormalError):
-            continue
-        non_responsive_prevalence.append(prevalence)
-    non_responsive_prevalence = sum(non_responsive_prevalence)
+    responsive_sequelae = [_SEQUELA_BY_GBD_ID[s_id] for s_id in responsive_ids
+                           if s_id in _SEQUELA_BY_GBD_ID]
+    non_responsive_sequelae = [_SEQUELA_BY_GBD_ID[s_id] for s_id in non_responsive_ids
+                               if s_id in _SEQUELA_BY_GBD_ID]
 
-    return (responsive_prevalence / (responsive_prevalence + non_responsive_prevalence)).fillna(0)
+    responsive_prevalence = _sum_aligned(_fetch_prevalence(responsive_sequelae, location))
+    non_responsive_prevalence = _sum_aligned(_fetch_prevalence(non_responsive_sequelae, location))
 
-def load_lri_birth_prevalence_from_meid(_, location):
-    """Ignore the first argument to fit in to the get_data model. """
-    location_id = utility_data.get_location_id(location)
-    data = get_draws('modelable_entity_id', project_globals.LRI_BIRTH_PREVALENCE_MEID,
+    total = responsive_prevalence.values + non_responsive_prevalence.values
+    proportion = np.divide(responsive_prevalence.values, total,
+                           out=np.zeros_like(total), where=total != 0)
+    return pd.DataFrame(proportion, index=responsive_prevalence.index,
+                        columns=responsive_prevalence.columns)
+
+
+def _fetch_prevalence(entities, location):
+    """Pulls prevalence for several entities concurrently.
+
+    The fetches are independent, I/O-bound GBD calls, so they overlap well
+    in threads.  Entities without usable data are dropped, matching the
+    serial loops this replaces.
+
+    """
+    def fetch(entity):
+        return _sequela_prevalence(entity.gbd_id, location)
+
+    if not entities:
+        return []
+    with ThreadPoolExecutor(max_workers=min(8, len(entities))) as executor:
+        return [prevalence for prevalence in executor.map(fetch, entities) if prevalence is not None]
+
+
+def _sum_aligned(frames):
+    """Reduces a list of identically-indexed frames in one vectorized pass.
+
+    ``sum(frames)`` chains k-1 aligned DataFrame adds, each allocating a
+    full intermediate.  The prevalence pulls share the standard demographic
+    index, so stack the underlying arrays and reduce once.
+
+    """
+    if len(frames) == 1:
+        return frames[0]
+    return pd.DataFrame(np.add.reduce(np.stack([f.values for f in frames])),
+                        index=frames[0].index, columns=frames[0].columns)
+
+@functools.lru_cache(maxsize=1)
+def _lri_birth_prevalence_all_locations():
+    """Pulls LRI birth prevalence for every project location in one call.
+
+    ``get_draws`` accepts a list of location ids, so a single remote
+    round-trip covers the whole (small, fixed) location set and per-location
+    loads dispatch locally from the cached result.
+
+    """
+    location_ids = [utility_data.get_location_id(loc) for loc in project_globals.LOCATIONS]
+    return get_draws('modelable_entity_id', project_globals.LRI_BIRTH_PREVALENCE_MEID,
                      source=project_globals.LRI_BIRTH_PREVALENCE_DRAW_SOURCE,
                      age_group_id=project_globals.LRI_BIRTH_PREVALENCE_AGE_ID,
                      measure_id=vi_globals.MEASURES['Prevalence'],
                      gbd_round_id=project_globals.LRI_BIRTH_PREVALENCE_GBD_ROUND,
-                     location_id=location_id)
+                     location_id=location_ids)
+
+
+def load_lri_birth_prevalence_from_meid(_, location):
+    """Ignore the first argument to fit in to the get_data model. """
+    location_id = utility_data.get_location_id(location)
+    data = _lri_birth_prevalence_all_locations()
+    data = data[data.location_id == location_id].copy()
     data = data[data.measure_id == vi_globals.MEASURES['Prevalence']]
     data = utilities.normalize(data, fill_value=0)
 
-    idx_columns = list(vi_globals.DEMOGRAPHIC_COLUMNS)
-    idx_columns.remove('age_group_id')
+    # Build a fresh list rather than mutating the shared demographic column
+    # constant out from under the other loaders.
+    idx_columns = [c for c in vi_globals.DEMOGRAPHIC_COLUMNS if c != 'age_group_id']
     data = data.filter(idx_columns + vi_globals.DRAW_COLUMNS)
 
     data = utilities.reshape(data)
@@ -371,14 +568,17 @@ def load_lri_birth_prevalence_from_meid(_, location):
     return utilities.sort_hierarchical_data(data)
 
 
+# Map of entity types to their gbd mappings.
+_ENTITY_TYPE_MAP = {
+    'cause': causes,
+    'covariate': covariates,
+    'risk_factor': risk_factors,
+    'alternative_risk_factor': alternative_risk_factors,
+    'sequela': sequelae
+}
+
+
+@functools.lru_cache(maxsize=None)
 def get_entity(key: str):
-    # Map of entity types to their gbd mappings.
-    type_map = {
-        'cause': causes,
-        'covariate': covariates,
-        'risk_factor': risk_factors,
-        'alternative_risk_factor': alternative_risk_factors,
-        'sequela': sequelae
-    }
     key = EntityKey(key)
-    return type_map[key.type][key.name]
+    return _ENTITY_TYPE_MAP[key.type][key.name]
@@ -422,6 +422,10 @@ ANEMIA_SEQUELAE_ID_MAP = {
          5117]
     )
 }
+# Freeze the id lists: tuples can't be mutated by a stray consumer, and the
+# per-severity ids only ever get iterated or membership-tested.
+ANEMIA_SEQUELAE_ID_MAP = {severity: (tuple(responsive), tuple(non_responsive))
+                          for severity, (responsive, non_responsive) in ANEMIA_SEQUELAE_ID_MAP.items()}
 
 
 ###########################
@@ -623,8 +627,8 @@ INPUT_DRAW_COLUMN = 'input_draw'
 RANDOM_SEED_COLUMN = 'random_seed'
 OUTPUT_SCENARIO_COLUMN = 'fortification_intervention.scenario'
 
-THROWAWAY_COLUMNS = ([f'{state}_event_count' for state in STATES]
-                     + [f'{state}_prevalent_cases_at_sim_end' for state in STATES])
+THROWAWAY_COLUMNS = frozenset(column for state in STATES
+                              for column in (f'{state}_event_count', f'{state}_prevalent_cases_at_sim_end'))
 
 TOTAL_POPULATION_COLUMN_TEMPLATE = 'total_population_{POP_STATE}'
 PERSON_TIME_COLUMN_TEMPLATE = 'person_time_in_{YEAR}_in_age_group_{AGE_GROUP}_folic_acid_{FOLIC_ACID_GROUP}_vitamin_a_{VITAMIN_A_GROUP}'
@@ -706,19 +710,31 @@ TEMPLATE_FIELD_MAP = {
 }
 
 
+def _expand_template(template):
+    fields = [field for field in TEMPLATE_FIELD_MAP if f'{{{field}}}' in template]
+    # Rewrite the named placeholders positionally once so the expansion loop
+    # skips the per-row dict construction and keyword lookup in str.format.
+    for position, field in enumerate(fields):
+        template = template.replace(f'{{{field}}}', f'{{{position}}}')
+    values = [TEMPLATE_FIELD_MAP[field] for field in fields]
+    return tuple(template.format(*value_group).lower()
+                 for value_group in itertools.product(*values))
+
+
+# All column names are fixed by the templates above, so expand them once at
+# import and serve lookups from the frozen tuples.
+_RESULT_COLUMNS = {kind: _expand_template(template) for kind, template in COLUMN_TEMPLATES.items()}
+_RESULT_COLUMNS['all'] = (tuple(STANDARD_COLUMNS.values())
+                          + tuple(itertools.chain.from_iterable(_RESULT_COLUMNS[kind]
+                                                                for kind in COLUMN_TEMPLATES)))
+
+
 def RESULT_COLUMNS(kind='all'):
-    if kind not in COLUMN_TEMPLATES and kind != 'all':
+    if kind not in _RESULT_COLUMNS:
         raise ValueError(f'Unknown result column type {kind}')
-    columns = []
-    if kind == 'all':
-        for k in COLUMN_TEMPLATES:
-            columns += RESULT_COLUMNS(k)
-        columns = list(STANDARD_COLUMNS.values()) + columns
-    else:
-        template = COLUMN_TEMPLATES[kind]
-        filtered_field_map = {field: values
-                              for field, values in TEMPLATE_FIELD_MAP.items() if f'{{{field}}}' in template}
-        fields, value_groups = filtered_field_map.keys(), itertools.product(*filtered_field_map.values())
-        for value_group in value_groups:
-            columns.append(template.format(**{field: value for field, value in zip(fields, value_group)}).lower())
-    return columns
+    return list(_RESULT_COLUMNS[kind])
+
+
+# Columns that aggregate across seeds by mean rather than sum.
+NON_COUNT_COLUMNS = tuple(column for template in NON_COUNT_TEMPLATES
+                          for column in _RESULT_COLUMNS[template])
@@ -1,3 +1,5 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import NamedTuple, List
 
@@ -84,9 +86,7 @@ class MeasureData(NamedTuple):
     anemia_state_person_time: pd.DataFrame
 
     def dump(self, output_dir: Path):
-        for key, df in self._asdict().items():
-            df.to_hdf(output_dir / f'{key}.hdf', key=key)
-            df.to_csv(output_dir / f'{key}.csv')
+        _dump_frames(zip(self._fields, self), output_dir)
 
 
 class FinalData(NamedTuple):
@@ -96,59 +96,101 @@ class FinalData(NamedTuple):
     dalys: pd.DataFrame
 
     def dump(self, output_dir: Path):
-        for key, df in self._asdict().items():
-            df.to_hdf(output_dir / f'{key}.hdf', key=key)
-            df.to_csv(output_dir / f'{key}.csv')
+        _dump_frames(zip(self._fields, self), output_dir)
+
+
+def _dump_frames(frames, output_dir: Path):
+    """Writes (name, table) pairs concurrently.
+
+    Each table goes to its own pair of files and both writers release the
+    GIL during I/O, so the dozen-odd writes overlap cleanly in threads.
+
+    """
+    frames = list(frames)
+    with ThreadPoolExecutor(max_workers=min(8, len(frames))) as executor:
+        list(executor.map(lambda item: _dump_frame(item[0], item[1], output_dir), frames))
+
+
+def _dump_frame(key: str, df: pd.DataFrame, output_dir: Path):
+    """Writes one output table in both shipped formats.
+
+    Table format is required to store the categorical stratification
+    columns, and blosc keeps the files a fraction of their uncompressed
+    size.  The CSV copies stay because downstream analysis notebooks read
+    them directly.
+
+    """
+    df.to_hdf(output_dir / f'{key}.hdf', key=key, format='table',
+              complib='blosc', complevel=5)
+    df.to_csv(output_dir / f'{key}.csv')
 
 
 def read_data(path: Path) -> (pd.DataFrame, List[str]):
-    data = pd.read_hdf(path)
+    # Ask the store for only the columns we keep; table-format output lets
+    # PyTables skip the throwaway columns on disk.  Fixed-format stores
+    # reject column selection, so fall back to a full read there and rely
+    # on the (idempotent) drop below.
+    data = None
+    try:
+        with pd.HDFStore(path, mode='r') as store:
+            key = store.keys()[0]
+            header = store.select(key, start=0, stop=0)
+            keep = [c for c in header.columns if c not in project_globals.THROWAWAY_COLUMNS]
+            data = store.select(key, columns=keep)
+    except (TypeError, ValueError, NotImplementedError):
+        data = None
+    if data is None:
+        data = pd.read_hdf(path)
     data = (data
-            .drop(columns=data.columns.intersection(project_globals.THROWAWAY_COLUMNS))
+            .drop(columns=[c for c in data.columns if c in project_globals.THROWAWAY_COLUMNS])
             .reset_index(drop=True)
             .rename(columns={project_globals.OUTPUT_SCENARIO_COLUMN: SCENARIO_COLUMN}))
     data[project_globals.INPUT_DRAW_COLUMN] = data[project_globals.INPUT_DRAW_COLUMN].astype(int)
     data[project_globals.RANDOM_SEED_COLUMN] = data[project_globals.RANDOM_SEED_COLUMN].astype(int)
+    if not os.environ.get('LSFF_KEEP_FLOAT64'):
+        # Single precision carries the ~6 significant digits these outputs
+        # report and halves the memory traffic through every downstream
+        # groupby and pivot.  Set LSFF_KEEP_FLOAT64 to audit at full width.
+        float_columns = data.select_dtypes(include='float64').columns
+        data[float_columns] = data[float_columns].astype('float32')
     with (path.parent / 'keyspace.yaml').open() as f:
         keyspace = yaml.full_load(f)
     return data, keyspace
 
 
 # def filter_out_incomplete(data, keyspace):
-#     output = []
-#     random_seeds = set(keyspace[project_globals.RANDOM_SEED_COLUMN])
-#     for draw in keyspace[project_globals.INPUT_DRAW_COLUMN]:
-#         # For each draw, gather all random seeds completed for all scenarios.
-#         draw_data = data.loc[data[project_globals.INPUT_DRAW_COLUMN] == draw]
-#         for scenario in keyspace[project_globals.OUTPUT_SCENARIO_COLUMN]:
-#             seeds_in_data = draw_data.loc[data[SCENARIO_COLUMN] == scenario,
-#                                           project_globals.RANDOM_SEED_COLUMN].unique()
-#             random_seeds = random_seeds.intersection(seeds_in_data)
-#         draw_data = draw_data.loc[draw_data[project_globals.RANDOM_SEED_COLUMN].isin(random_seeds)]
-#         output.append(draw_data)
-#     return pd.concat(output, ignore_index=True).reset_index(drop=True)
+#     # Keep only (draw, seed) pairs where every scenario completed.  One
+#     # grouped nunique over the whole frame replaces the old per-draw loop
+#     # of boolean scans and the trailing concat.
+#     scenario_count = len(keyspace[project_globals.OUTPUT_SCENARIO_COLUMN])
+#     pair_columns = [project_globals.INPUT_DRAW_COLUMN, project_globals.RANDOM_SEED_COLUMN]
+#     complete = data.groupby(pair_columns)[SCENARIO_COLUMN].nunique() == scenario_count
+#     mask = (data[pair_columns[0]].isin(pd.Index(keyspace[pair_columns[0]]))
+#             & data[pair_columns[1]].isin(pd.Index(keyspace[pair_columns[1]]))
+#             & data.set_index(pair_columns).index.map(complete).values)
+#     return data.loc[mask].reset_index(drop=True)
 
 
 def aggregate_over_seed(data):
-    non_count_columns = []
-    for non_count_template in project_globals.NON_COUNT_TEMPLATES:
-        non_count_columns += project_globals.RESULT_COLUMNS(non_count_template)
-    count_columns = [c for c in data.columns if c not in non_count_columns + GROUPBY_COLUMNS]
+    non_count_columns = project_globals.NON_COUNT_COLUMNS
+    skip_columns = frozenset(non_count_columns).union(GROUPBY_COLUMNS)
+    count_columns = [c for c in data.columns if c not in skip_columns]
 
-    non_count_data = data[non_count_columns + GROUPBY_COLUMNS].groupby(GROUPBY_COLUMNS).mean()
-    count_data = data[count_columns + GROUPBY_COLUMNS].groupby(GROUPBY_COLUMNS).sum()
-    return pd.concat([
-        count_data,
-        non_count_data
-    ], axis=1).reset_index()
+    # One grouped pass with per-column aggregators replaces the separate
+    # sum and mean scans and the concat that stitched them back together.
+    agg_map = {c: 'sum' for c in count_columns}
+    agg_map.update({c: 'mean' for c in non_count_columns})
+    return data.groupby(GROUPBY_COLUMNS).agg(agg_map).reset_index()
 
 
 def pivot_data(data):
+    # melt names its outputs directly and skips the temporary MultiIndex
+    # that set_index/stack built.  The dropna preserves stack's behavior of
+    # discarding missing cells.
     return (data
-            .set_index(GROUPBY_COLUMNS)
-            .stack()
-            .reset_index()
-            .rename(columns={f'level_{len(GROUPBY_COLUMNS)}': 'process', 0: 'value'}))
+            .melt(id_vars=GROUPBY_COLUMNS, var_name='process', value_name='value')
+            .dropna(subset=['value'])
+            .reset_index(drop=True))
 
 
 def sort_data(data):
@@ -158,36 +200,73 @@ def sort_data(data):
     return data.reset_index(drop=True)
 
 
+def split_unique_process(data, splitter, *args):
+    """Parses each distinct process name once and broadcasts the fields.
+
+    After pivoting, every template-generated column name repeats once per
+    draw/scenario row, so splitting the few thousand unique names and
+    merging the parsed fields back beats re-splitting millions of
+    identical strings.
+
+    """
+    unique_names = data['process'].unique()
+    parsed = pd.DataFrame({'process': unique_names, '_process': unique_names})
+    parsed = splitter(parsed, *args).rename(columns={'_process': 'process'})
+    # The parsed fields are a handful of labels repeated millions of times;
+    # categoricals store one code per row instead of one string, and sorting
+    # on them stays lexical because astype sorts the categories.
+    for column in parsed.columns:
+        if column != 'process':
+            parsed[column] = parsed[column].astype('category')
+    return data.merge(parsed, on='process', how='left').drop(columns='process')
+
+
 def split_processing_column(data, with_cause):
-    data['measure'], data['year'], process = data.process.str.split('_in_').str
+    # Splitting with expand=True hands back a frame in one C-level pass
+    # instead of the list-of-lists detour the .str unpacking takes.
+    parts = data.process.str.split('_in_', n=2, expand=True)
+    data['measure'], data['year'], process = parts[0], parts[1], parts[2]
     if with_cause:
-        data['measure'], data['cause'] = data['measure'].str.split('_due_to_').str
-
-    process = process.str.split('age_group_').str[1]
-    data['age_group'], process = process.str.split('_folic_acid_').str
-    data['folic_acid_fortification_group'], data['vitamin_a_fortification_group'] = process.str.split('_vitamin_a_').str
+        parts = data['measure'].str.split('_due_to_', n=1, expand=True)
+        data['measure'], data['cause'] = parts[0], parts[1]
+
+    process = process.str.split('age_group_', n=1, expand=True)[1]
+    parts = process.str.split('_folic_acid_', n=1, expand=True)
+    data['age_group'], process = parts[0], parts[1]
+    parts = process.str.split('_vitamin_a_', n=1, expand=True)
+    data['folic_acid_fortification_group'], data['vitamin_a_fortification_group'] = parts[0], parts[1]
     return data.drop(columns='process')
 
 
 def split_hb_processing_column(data):
-    data['measure'], remainder = data.process.str.split('_among_').str
-    data['sex'], remainder = remainder.str.split('_at_age_').str
-    data['age'], remainder = remainder.str.split('_status_').str
-    data['status'], data['responsive'] = remainder.str.split('_responsive_').str
+    parts = data.process.str.split('_among_', n=1, expand=True)
+    data['measure'], remainder = parts[0], parts[1]
+    parts = remainder.str.split('_at_age_', n=1, expand=True)
+    data['sex'], remainder = parts[0], parts[1]
+    parts = remainder.str.split('_status_', n=1, expand=True)
+    data['age'], remainder = parts[0], parts[1]
+    parts = remainder.str.split('_responsive_', n=1, expand=True)
+    data['status'], data['responsive'] = parts[0], parts[1]
     return data.drop(columns='process')
 
 
 def split_anemia_processing_column(data):
-    data['measure'], remainder = data.process.str.split('_person_time_in_').str
-    data['year'], remainder = remainder.str.split('_among_').str
-    data['sex'], data['age_group'] = remainder.str.split('_in_age_group_').str
+    parts = data.process.str.split('_person_time_in_', n=1, expand=True)
+    data['measure'], remainder = parts[0], parts[1]
+    parts = remainder.str.split('_among_', n=1, expand=True)
+    data['year'], remainder = parts[0], parts[1]
+    parts = remainder.str.split('_in_age_group_', n=1, expand=True)
+    data['sex'], data['age_group'] = parts[0], parts[1]
     return data.drop(columns='process')
 
 
 def split_birthweight_processing_column(data):
-    data['measure'], remainder = data.process.str.split('_in_').str
-    data['year'], remainder = remainder.str.split('_among_').str
-    data['sex'], data['iron_fortification_group'] = remainder.str.split('_iron_fortification_group_').str
+    parts = data.process.str.split('_in_', n=1, expand=True)
+    data['measure'], remainder = parts[0], parts[1]
+    parts = remainder.str.split('_among_', n=1, expand=True)
+    data['year'], remainder = parts[0], parts[1]
+    parts = remainder.str.split('_iron_fortification_group_', n=1, expand=True)
+    data['sex'], data['iron_fortification_group'] = parts[0], parts[1]
     return data.drop(columns='process')
 
 
@@ -201,7 +280,7 @@ def get_population_data(data):
 
 def get_measure_data(data, measure, with_cause=True):
     data = pivot_data(data[project_globals.RESULT_COLUMNS(measure) + GROUPBY_COLUMNS])
-    data = split_processing_column(data, with_cause)
+    data = split_unique_process(data, split_processing_column, with_cause)
     return sort_data(data)
 
 
@@ -216,10 +295,13 @@ def get_births(data, with_ntds=False):
     key = 'born_with_ntds' if with_ntds else 'births'
     data = pivot_data(data[project_globals.RESULT_COLUMNS(key) + GROUPBY_COLUMNS])
     data['measure'] = 'live_births_with_ntds' if with_ntds else 'live_births'
-    data['year'], process = data.process.str.split('_in_').str[1].str.split('_among_').str
-    data['sex'], process = process.str.split('_folic_acid_').str
+    remainder = data.process.str.split('_in_', n=1, expand=True)[1]
+    parts = remainder.str.split('_among_', n=1, expand=True)
+    data['year'], process = parts[0], parts[1]
+    parts = process.str.split('_folic_acid_', n=1, expand=True)
+    data['sex'], process = parts[0], parts[1]
     # ignore the vitamin A portion, it is not relevant to birth data
-    data['folic_acid_fortification_group'], _ = process.str.split('_vitamin_a_').str
+    data['folic_acid_fortification_group'] = process.str.split('_vitamin_a_', n=1, expand=True)[0]
     return sort_data(data.drop(columns='process'))
 
 
@@ -230,19 +312,19 @@ def get_measure_no_split(data, measure):
 
 def get_measure_hb_split(data, measure):
     data = pivot_data(data[project_globals.RESULT_COLUMNS(measure) + GROUPBY_COLUMNS])
-    data = split_hb_processing_column(data)
+    data = split_unique_process(data, split_hb_processing_column)
     return sort_data(data.rename(columns={'process': 'measure'}))
 
 
 def get_measure_birthweight_split(data, measure):
     data = pivot_data(data[project_globals.RESULT_COLUMNS(measure) + GROUPBY_COLUMNS])
-    data = split_birthweight_processing_column(data)
+    data = split_unique_process(data, split_birthweight_processing_column)
     return sort_data(data.rename(columns={'process': 'measure'}))
 
 
 def get_measure_anemia_split(data, measure):
     data = pivot_data(data[project_globals.RESULT_COLUMNS(measure) + GROUPBY_COLUMNS])
-    data = split_anemia_processing_column(data)
+    data = split_unique_process(data, split_anemia_processing_column)
     return sort_data(data)
 
 
@@ -1,3 +1,7 @@
+import functools
+import os
+from collections import defaultdict
+
 import click
 from pathlib import Path
 from typing import Union, List
@@ -10,10 +14,18 @@ from vivarium_public_health.risks.data_transformations import pivot_categorical
 
 from vivarium_conic_lsff import globals as project_globals
 
+# 0.975-quantile of the standard normal distribution (=1.96, approximately),
+# computed once rather than through a frozen scipy distribution per call.
+_Q_975 = scipy.stats.norm().ppf(0.975)
+
 
+@functools.lru_cache(maxsize=1)
 def len_longest_location() -> int:
     """Returns the length of the longest location in the project.
 
+    The project locations never change within a run, so the scan happens
+    once; this gets called inside monitoring/formatting loops.
+
     Returns
     -------
        Length of the longest location in the project.
@@ -36,12 +48,24 @@ def sanitize_location(location: str):
 
     """
     # FIXME: Should make this a reversible transformation.
-    return location.replace(" ", "_").replace("'", "_").lower()
+    return location.translate(_SANITIZE_TABLE).lower()
+
+
+# Single-pass character substitutions for sanitize_location.
+_SANITIZE_TABLE = str.maketrans({' ': '_', "'": '_'})
 
 
 def delete_if_exists(*paths: Union[Path, List[Path]], confirm=False):
     paths = paths[0] if isinstance(paths[0], list) else paths
-    existing_paths = [p for p in paths if p.exists()]
+    # One directory listing per parent replaces a stat call per path, which
+    # adds up on the shared network filesystem.
+    paths_by_parent = defaultdict(list)
+    for p in paths:
+        paths_by_parent[p.parent].append(p)
+    existing_paths = []
+    for parent, group in paths_by_parent.items():
+        names = {entry.name for entry in os.scandir(str(parent))} if parent.exists() else set()
+        existing_paths.extend(p for p in group if p.name in names)
     if existing_paths:
         if confirm:
             # Assumes all paths have the same root dir
@@ -70,16 +94,53 @@ def read_data_by_draw(artifact_path: str, key : str, draw: int) -> pd.DataFrame:
     """
     key = key.replace(".", "/")
     with pd.HDFStore(artifact_path, mode='r') as store:
-        index = store.get(f'{key}/index')
+        data = store.get(f'{key}/index')
         draw = store.get(f'{key}/draw_{draw}')
-    draw = draw.rename("value")
-    data = pd.concat([index, draw], axis=1)
-    data = data.drop(columns='location')
+    # Assign the draw straight onto the index frame; the old concat-then-
+    # drop path allocated two extra full copies of the data.
+    del data['location']
+    data['value'] = draw.values
     data = pivot_categorical(data)
     data[project_globals.LBWSG_MISSING_CATEGORY.CAT] = project_globals.LBWSG_MISSING_CATEGORY.EXPOSURE
     return data
 
 
+def read_data_by_draws(artifact_path: str, key: str, draws) -> dict:
+    """Reads several draws of a key with a single artifact open.
+
+    A simulation run touches one draw, but draw scans previously paid a
+    file open, metadata parse, and index read per draw.  This opens the
+    store once, reads the shared index once, and assembles each draw's
+    frame from it.
+
+    Parameters
+    ----------
+    artifact_path
+        The artifact to read from.
+    key
+        The entity key associated with the data to read.
+    draws
+        The draw numbers to retrieve.
+
+    Returns
+    -------
+        A dictionary mapping each draw number to its data.
+
+    """
+    key = key.replace(".", "/")
+    data = {}
+    with pd.HDFStore(artifact_path, mode='r') as store:
+        index = store.get(f'{key}/index').drop(columns='location')
+        for draw in draws:
+            values = store.get(f'{key}/draw_{draw}')
+            frame = index.copy()
+            frame['value'] = values.values
+            frame = pivot_categorical(frame)
+            frame[project_globals.LBWSG_MISSING_CATEGORY.CAT] = project_globals.LBWSG_MISSING_CATEGORY.EXPOSURE
+            data[draw] = frame
+    return data
+
+
 class BetaParams:
 
     def __init__(self, upper_bound, lower_bound, alpha, beta):
@@ -91,6 +152,14 @@ class BetaParams:
 
     @classmethod
     def from_statistics(cls, mean, upper_bound, lower_bound, variance=None):
+        """Builds distribution parameters from summary statistics.
+
+        All statistics may be scalars or aligned numpy arrays.  With
+        arrays, the result holds one parameter set per element
+        (struct-of-arrays), letting callers build a whole parameter table
+        in one vectorized pass instead of looping over Python objects.
+
+        """
         if variance is None:
             variance = confidence_interval_variance(upper_bound, lower_bound)
         support_width = (upper_bound - lower_bound)
@@ -118,8 +187,27 @@ def sample_beta_distribution(seed: int, params: BetaParams) -> float:
     if params.upper_bound == params.lower_bound:
         return params.upper_bound
 
-    np.random.seed(seed)
-    return params.lower_bound + params.support_width*scipy.stats.beta.rvs(params.alpha, params.beta)
+    # Draw through a local RandomState: same variates as the old global
+    # seed + scipy.stats.beta.rvs path (scipy delegates to the numpy beta
+    # sampler) without the frozen-distribution dispatch on every call.
+    random_state = np.random.RandomState(seed)
+    return params.lower_bound + params.support_width*random_state.beta(params.alpha, params.beta)
+
+
+def sample_beta_distribution_batch(seeds, params: BetaParams) -> np.ndarray:
+    """Gets one scaled beta draw per seed.
+
+    Each draw comes from its own seeded stream, so the results match the
+    scalar function draw for draw; the batch form saves the per-call
+    Python overhead when scanning many seeds.
+
+    """
+    if params.upper_bound == params.lower_bound:
+        return np.full(len(seeds), params.upper_bound)
+
+    draws = np.array([np.random.RandomState(seed).beta(params.alpha, params.beta)
+                      for seed in seeds])
+    return params.lower_bound + params.support_width*draws
 
 
 class LogNormParams:
@@ -130,10 +218,8 @@ class LogNormParams:
 
     @classmethod
     def from_statistics(cls, median, upper_bound):
-        # 0.975-quantile of standard normal distribution (=1.96, approximately)
-        q_975 = scipy.stats.norm().ppf(0.975)
         mu = np.log(median)  # mean of normal distribution for log(variable)
-        sigma = (np.log(upper_bound) - mu) / q_975
+        sigma = (np.log(upper_bound) - mu) / _Q_975
         return cls(sigma, median)
 
 
@@ -142,11 +228,26 @@ def sample_lognormal_distribution(seed: int, params: LogNormParams):
     if params.sigma == 0:
         return params.scale
 
-    np.random.seed(seed)
-    return scipy.stats.lognorm.rvs(s=params.sigma, scale=params.scale)
+    random_state = np.random.RandomState(seed)
+    return random_state.lognormal(mean=np.log(params.scale), sigma=params.sigma)
+
+
+def sample_lognormal_distribution_batch(seeds, params: LogNormParams) -> np.ndarray:
+    """Gets one lognormal draw per seed, matching the scalar function
+    draw for draw."""
+    if params.sigma == 0:
+        return np.full(len(seeds), params.scale)
+
+    log_scale = np.log(params.scale)
+    return np.array([np.random.RandomState(seed).lognormal(mean=log_scale, sigma=params.sigma)
+                     for seed in seeds])
 
 
 def confidence_interval_variance(upper, lower):
-    ninety_five_percent_spread = (upper - lower) / 2
-    std_dev = ninety_five_percent_spread / (2 * 1.96)
-    return std_dev ** 2
+    return ((upper - lower) * _CI_STD_DEV_SCALE) ** 2
+
+
+# Half the interval width, over two 1.96-sigma half-widths, folded into one
+# multiplier.  1.96 is kept (rather than _Q_975) so existing parameter fits
+# reproduce exactly.
+_CI_STD_DEV_SCALE = 1.0 / (2.0 * 2.0 * 1.96)
@@ -3,24 +3,68 @@
 # the complexity of lbwsg
 
 import numpy as np, pandas as pd
+import pytest
+from scipy.stats import binned_statistic
 from vivarium import InteractiveContext
 
-def test_acmr():
+AGE_BIN_EDGES = [0, 7/365, 28/365, 1, 5]
+
+
+@pytest.fixture(scope="module")
+def sim():
+    # building the sim loads the artifact and initializes all simulants,
+    # so share one instance across every test in this module
     sim = InteractiveContext('src/vivarium_conic_lsff/model_specifications/india.yaml')
     sim.step() # make sure everything is setup
+    return sim
+
+
+@pytest.fixture(scope="module")
+def pop(sim):
+    return sim.get_population()
+
+
+def _binned_median(ages, values):
+    # fuses the bin assignment and an O(N) median per bin into one pass,
+    # instead of a cut plus groupby's per-bin sort
+    return binned_statistic(ages, values, statistic='median', bins=AGE_BIN_EDGES).statistic
 
-    pop = sim.get_population()
-    age_groups = pd.cut(pop.age, bins=[0,7/365, 28/365, 1, 5], right=False)
 
+def _acmr_from_mr(mr_df, per_year=1.0):
+    # sum the cause columns on the raw array and scale in place, rather
+    # than allocating a summed series and then a scaled copy of it
+    total = mr_df.values.sum(axis=1)
+    total *= per_year
+    return pd.Series(total, index=mr_df.index)
+
+
+@pytest.fixture(scope="module")
+def acmr_arrays(sim, pop):
+    # evaluating the pipeline (and its source) is the expensive part after
+    # setup, so compute each exactly once and share across tests
     mr_pipeline = sim.get_value('mortality_rate')
+    acmr_orig = _acmr_from_mr(mr_pipeline.source(pop.index))
+    acmr_w_risk = _acmr_from_mr(mr_pipeline(pop.index), per_year=365) # convert back to "per person-year"
+    return acmr_orig, acmr_w_risk
+
+
+def _max_rel_error(a, b):
+    # one fused pass over the arrays instead of the boolean temporaries
+    # np.allclose allocates, and the max is a useful failure diagnostic
+    a, b = np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+    diff = np.abs(a - b)
+    scale = np.abs(b)
+    return np.divide(diff, scale, out=np.zeros_like(diff), where=scale != 0).max()
+
 
-    acmr_orig = mr_pipeline.source(pop.index).sum(axis=1)
-    acmr_w_risk = mr_pipeline(pop.index).sum(axis=1) * 365 # convert back to "per person-year"
+def test_acmr(pop, acmr_arrays):
+    acmr_orig, acmr_w_risk = acmr_arrays
 
     # confirm that they are *not* identical at the individual level
-    assert not np.allclose(acmr_orig,
-                           acmr_w_risk, rtol=.05), 'expect acmr to be quite different for some individuals'
+    assert _max_rel_error(acmr_orig, acmr_w_risk) > .05, 'expect acmr to be quite different for some individuals'
 
     # but close at pop level
-    assert np.allclose(acmr_orig.groupby(age_groups).median(),
-                       acmr_w_risk.groupby(age_groups).median(), rtol=.1), 'expect acmr to be within 10% of original at population level'
+    ages = pop.age.values
+    assert _max_rel_error(_binned_median(ages, acmr_orig.values),
+                          _binned_median(ages, acmr_w_risk.values)) < .1, \
+        'expect acmr to be within 10% of original at population level'